@@ -34,15 +34,19 @@ class InventoryManager:
         self.min_exposure_usd = min_exposure_usd
         self.target_balance = target_balance
         self.inventory = Inventory()
-        self.max_exposure_shares = max_exposure_usd * 2.0 
+        self.max_exposure_shares = max_exposure_usd * 2.0
         self.min_exposure_shares = min_exposure_usd * 2.0
+        # 인벤토리가 변할 때마다 증가 — 외부 캐시(RiskManager 등)의 무효화 기준
+        self.version = 0
 
     def reset(self):
         self.inventory = Inventory()
+        self.version += 1
         logger.info("inventory_manager_reset_complete")
 
     def update_inventory(self, yes_delta: float, no_delta: float):
         self.inventory.update(yes_delta, no_delta)
+        self.version += 1
 
     # [수정] 외부(웹사이트)에서 수행된 Split 결과 잔고를 동기화하는 기능 추가
     def sync_inventory(self, yes_balance: float, no_balance: float):
@@ -50,7 +54,8 @@ class InventoryManager:
         self.inventory.yes_position = yes_balance
         self.inventory.no_position = no_balance
         self.inventory.net_exposure_shares = yes_balance - no_balance
-        
+        self.version += 1
+
         logger.info("🔄 Inventory Synced from On-chain Balance", 
                     yes=self.inventory.yes_position, 
                     no=self.inventory.no_position)
@@ -60,6 +65,7 @@ class InventoryManager:
         self.inventory.yes_position += amount_shares
         self.inventory.no_position += amount_shares
         self.inventory.net_exposure_shares = self.inventory.yes_position - self.inventory.no_position
+        self.version += 1
 
     def can_quote_yes(self, size_shares: float) -> bool:
         potential_exposure = self.inventory.net_exposure_shares + size_shares
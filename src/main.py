@@ -21,7 +21,7 @@ from src.market_maker.quote_engine import QuoteEngine
 from src.polymarket.order_signer import OrderSigner
 from src.polymarket.honeypot_service import HoneypotService
 from src.polymarket.websocket_client import PolymarketWebSocketClient
-from src.risk.risk_manager import RiskManager
+from src.risk.risk_manager import RiskManager, size_array
 from src.services import AutoRedeem, start_metrics_server
 
 # 로깅 설정
@@ -275,6 +275,23 @@ class MarketMakerBot:
             reverse=reverse
         )
 
+    def _build_book_state(self, bids: list, asks: list) -> dict[str, Any]:
+        """정렬된 호가와 함께 사이즈 배열(SoA)을 수신 시점에 한 번만 생성합니다."""
+        sorted_bids = self._sort_book(bids, reverse=True)
+        sorted_asks = self._sort_book(asks)
+        bid_sizes = size_array(sorted_bids)
+        ask_sizes = size_array(sorted_asks)
+        return {
+            "bids": sorted_bids,
+            "asks": sorted_asks,
+            # RiskManager.validate_obi가 주문마다 재변환하지 않도록 캐싱
+            "bid_sizes": bid_sizes,
+            "ask_sizes": ask_sizes,
+            # OBI 검증이 O(1) 읽기만 하도록 상위 3호가 물량 합까지 미리 계산
+            "top3_bid_sum": float(bid_sizes[:3].sum()),
+            "top3_ask_sum": float(ask_sizes[:3].sum()),
+        }
+
     async def update_orderbook(self):
         """REST API를 통한 강제 업데이트 시에도 구조 유지"""
         session = await self.honeypot_service.get_session()
@@ -282,11 +299,10 @@ class MarketMakerBot:
             if not tid: continue
             book = await self.honeypot_service.get_orderbook(session, tid)
             if book and "bids" in book:
-                # 데이터를 저장할 때 정렬하여 저장
-                self.orderbooks[tid] = {
-                    "bids": self._sort_book(book.get("bids", []), reverse=True),
-                    "asks": self._sort_book(book.get("asks", []))
-                }
+                # 데이터를 저장할 때 정렬 및 사이즈 배열 생성
+                self.orderbooks[tid] = self._build_book_state(
+                    book.get("bids", []), book.get("asks", [])
+                )
 
     # =========================================================================
     # 3. Event Handlers (웹소켓 데이터 수신)
@@ -298,10 +314,9 @@ class MarketMakerBot:
         book_data = data.get("book") if data.get("book") else data
     
         if asset_id and "bids" in book_data:
-            self.orderbooks[asset_id] = {
-                "bids": self._sort_book(book_data.get("bids", []), reverse=True),
-                "asks": self._sort_book(book_data.get("asks", []))
-            }
+            self.orderbooks[asset_id] = self._build_book_state(
+                book_data.get("bids", []), book_data.get("asks", [])
+            )
             
             # [수정] 인덱스 [0][0] 직접 접근 대신 안전한 함수 사용
             if self.orderbooks[asset_id]["bids"]:
@@ -550,7 +565,7 @@ class MarketMakerBot:
         # Risk Manager 검증
         # [수정] 해당 토큰의 오더북을 참조하여 검증
         token_book = self.orderbooks.get(quote.token_id, {})
-        valid, reason = self.risk_manager.validate_order(quote.side, quote.price, token_book)
+        valid, reason = self.risk_manager.validate_order(quote.side, quote.price, token_book, size=quote.size)
         
         if not valid:
             logger.debug("quote_skipped", reason=reason, outcome=outcome)
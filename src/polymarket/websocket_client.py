@@ -1,26 +1,129 @@
 # src/polymarket/websocket_client.py
 from __future__ import annotations
 import asyncio
-import json
+import functools
+import random
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
 from typing import Any, Callable
 import structlog
 import websockets
 from src.config import Settings
 
+# [성능] 디코더 우선순위: msgspec > orjson > stdlib json (미설치 시 순차 폴백)
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    import msgspec
+
+    # 핸들러들이 dict 기반(asset_id/book/price 등 가변 필드)이므로 타입 없는 디코더 사용
+    _loads = msgspec.json.Decoder().decode
+except ImportError:
+    pass
+
 logger = structlog.get_logger(__name__)
 
+# 버스트 수신 시 한 번에 처리할 최대 프레임 수 (핸들러 디스패치 비용 분할 상환)
+_MAX_DRAIN = 32
+
+# 이 크기를 넘는 스냅샷 프레임은 파싱이 이벤트 루프를 막지 않도록 스레드로 넘김
+# (8KB 부근이 스레드 전환 비용과 파싱 비용이 균형을 이루는 지점)
+_LARGE_FRAME_BYTES = 8192
+# worker 1개로 고정하여 마켓별 FIFO 순서 유지
+_PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ws-parse")
+
+class MsgType(IntEnum):
+    """핸들러 점프 테이블용 메시지 타입 인덱스"""
+    BOOK = 0
+    PRICE_CHANGE = 1
+    TICK_SIZE_CHANGE = 2
+    LAST_TRADE_PRICE = 3
+    TRADE = 4
+    USER = 5
+
+# 수신 프레임의 type/event_type 문자열 → 점프 테이블 인덱스 (별칭 포함)
+_TYPE_MAP: dict[str, int] = {
+    "book": int(MsgType.BOOK),
+    "l2_book": int(MsgType.BOOK),
+    "order_book_l2": int(MsgType.BOOK),
+    "price_change": int(MsgType.PRICE_CHANGE),
+    "tick_size_change": int(MsgType.TICK_SIZE_CHANGE),
+    "last_trade_price": int(MsgType.LAST_TRADE_PRICE),
+    "trade": int(MsgType.TRADE),
+    "user": int(MsgType.USER),
+}
+
+@functools.lru_cache(maxsize=4096)
+def _subscribe_bytes(channel: str, market: str, user: str) -> bytes:
+    """고정 형태의 구독 메시지를 직렬화하여 캐싱 (재구독/재연결 시 dict 할당·인코딩 생략)"""
+    if channel == "user":
+        return _dumps({"type": "subscribe", "channel": "user", "user": user})
+    return _dumps({"type": "subscribe", "assets_ids": [market], "channels": [channel]})
+
 class PolymarketWebSocketClient:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.ws_url = settings.polymarket_ws_url.strip().replace('"', '').replace("'", "")
         self.websocket = None
-        self.message_handlers = {}
+        # 리스트 인덱싱 점프 테이블 (문자열 해시 대신 정수 인덱스 조회)
+        self._handlers: list[Callable | None] = [None] * len(MsgType)
+        self._batch_handlers: list[Callable | None] = [None] * len(MsgType)
         self.running = False
-        self._subscriptions = {} 
+        self._subscriptions = {}
+        # 현재 연결에서 실제로 전송에 성공한 구독만 기록 (dedup 기준)
+        self._sent_subscriptions = {}
         self._connect_lock = asyncio.Lock()
+        # 연결 완료(재구독까지) 여부 게이트 — None 체크 경쟁 없이 원자적으로 대기
+        self._ready = asyncio.Event()
+        # 재연결 백오프용 연속 실패 횟수
+        self._retries = 0
+
+    def _type_index(self, message_type: str) -> int:
+        """타입 문자열을 점프 테이블 인덱스로 변환 (미등록 타입은 테이블 확장)"""
+        idx = _TYPE_MAP.get(message_type)
+        if idx is None:
+            idx = len(_TYPE_MAP)
+            _TYPE_MAP[message_type] = idx
+        while idx >= len(self._handlers):
+            self._handlers.append(None)
+            self._batch_handlers.append(None)
+        return idx
 
     def register_handler(self, message_type: str, handler: Callable):
-        self.message_handlers[message_type] = handler
+        self._handlers[self._type_index(message_type)] = handler
+
+    def register_batch_handler(self, message_type: str, handler: Callable):
+        """버스트 구간에서 같은 타입의 메시지 리스트를 한 번에 받는 핸들러 등록"""
+        self._batch_handlers[self._type_index(message_type)] = handler
+
+    def _drain_pending(self, limit: int) -> list:
+        """수신 큐에 이미 쌓여 있는 프레임을 논블로킹으로 최대 limit개 회수 (라이브러리 버전 대응)"""
+        frames: list = []
+        queue = getattr(self.websocket, "messages", None)
+        if queue is None:
+            return frames
+        while len(frames) < limit:
+            try:
+                if hasattr(queue, "get_nowait"):
+                    frames.append(queue.get_nowait())
+                else:
+                    frames.append(queue.popleft())
+            except Exception:
+                break
+        return frames
 
     def _is_websocket_open(self) -> bool:
         """현재 웹소켓이 활성화 상태인지 확인 (다양한 라이브러리 버전 대응)"""
@@ -35,12 +138,14 @@ class PolymarketWebSocketClient:
         state = str(getattr(self.websocket, 'state', '')).upper()
         return "OPEN" in state or "CONNECTING" in state
 
-    async def _send_subscribe(self, message: dict):
+    async def _send_subscribe(self, sub_key: str, payload: bytes):
         """구독 정보를 캐싱하고, 안전하게 전송합니다."""
-        channel = message.get('channel') or (message.get('channels')[0] if message.get('channels') else 'unknown')
-        market = message.get('market') or (message.get('assets_ids')[0] if message.get('assets_ids') else '')
-        sub_key = f"{channel}:{market}"
-        self._subscriptions[sub_key] = message
+        # 연결이 살아있고 동일 payload가 '실제로 전송 성공'했다면 재전송 생략
+        # (서버측 중복 구독 스로틀로 정상 구독 ack가 지연되는 것을 방지)
+        if self._is_websocket_open() and self._sent_subscriptions.get(sub_key) == payload:
+            return
+        # 이미 직렬화된 bytes를 저장하여 재연결 시 재인코딩을 생략
+        self._subscriptions[sub_key] = payload
 
         # 연결이 되어 있지 않거나 끊겼다면 connect() 호출
         if not self._is_websocket_open():
@@ -48,9 +153,13 @@ class PolymarketWebSocketClient:
             # connect() 내부에서 이미 모든 구독 정보를 재전송하므로 여기서 종료
             return
 
-        # 이미 열린 상태라면 이 메시지만 전송
+        # 이미 열린 상태라면 이 메시지만 전송 (connect 진행 중이면 재구독 완료까지 대기)
         try:
-            await self.websocket.send(json.dumps(message))
+            await self._ready.wait()
+            await self.websocket.send(payload)
+            # 전송이 성공한 뒤에만 dedup 캐시에 기록 — 실패한 구독이
+            # dedup에 걸려 연결 수명 내내 누락되는 것을 방지
+            self._sent_subscriptions[sub_key] = payload
         except Exception as e:
             logger.debug("subscribe_send_failed_retrying", error=str(e))
             await self.connect()
@@ -60,8 +169,16 @@ class PolymarketWebSocketClient:
         async with self._connect_lock:
             # Lock 획득 후 다시 한번 상태 확인 (중복 연결 방지)
             if self._is_websocket_open():
+                # 소켓이 살아있으면 게이트도 반드시 열어 둔다 — 핸들러 예외 등으로
+                # 게이트만 닫힌 상태가 남으면 이후 모든 전송이 영구 대기에 빠짐
+                self._ready.set()
+                # 살아있는 연결은 실패가 아니므로 백오프 카운터도 초기화
+                self._retries = 0
                 return
 
+            self._ready.clear()
+            # 새 연결 기준으로 전송 성공 기록을 다시 쌓는다
+            self._sent_subscriptions = {}
             try:
                 # [개선] 기존 연결이 유효하지 않을 때만 명시적으로 닫기
                 if self.websocket:
@@ -84,58 +201,136 @@ class PolymarketWebSocketClient:
                 # 저장된 모든 구독 정보 일괄 전송
                 if self._subscriptions:
                     logger.info("resubscribing_to_all_channels", count=len(self._subscriptions))
-                    for sub_msg in self._subscriptions.values():
-                        await self.websocket.send(json.dumps(sub_msg))
-                
+                    # 재구독 버스트를 순차 await 대신 동시 전송
+                    await asyncio.gather(
+                        *(self.websocket.send(p) for p in self._subscriptions.values())
+                    )
+                    # 일괄 재전송 성공 — 전부 전송 완료로 기록
+                    self._sent_subscriptions = dict(self._subscriptions)
+
+                # 연결 성공 — 백오프 카운터 초기화
+                self._retries = 0
+                # 재구독까지 끝난 뒤에야 대기 중인 전송자들을 깨움
+                self._ready.set()
                 logger.info("websocket_connected_and_resubscribed")
             except Exception as e:
                 logger.error("websocket_connection_failed", error=str(e))
                 raise
 
     async def subscribe_orderbook(self, market_id: str):
-        message = {
-            "type": "subscribe",
-            "assets_ids": [market_id],
-            "channels": ["order_book_l2"],
-        }
-        await self._send_subscribe(message)
+        await self._send_subscribe(
+            f"order_book_l2:{market_id}",
+            _subscribe_bytes("order_book_l2", market_id, ""),
+        )
         logger.info("orderbook_subscribed", market_id=market_id)
 
     async def subscribe_user(self, user_address: str):
-        message = {
-            "type": "subscribe", 
-            "channel": "user", 
-            "user": user_address
-        }
-        await self._send_subscribe(message)
+        await self._send_subscribe(
+            f"user:{user_address}",
+            _subscribe_bytes("user", "", user_address),
+        )
         logger.info("user_channel_subscribed", address=user_address)
 
     async def listen(self):
         """메시지 수신 루프"""
         if not self._is_websocket_open():
             await self.connect()
-            
+
+        # [성능] 핫루프에서 반복되는 속성/바운드 메서드 조회를 로컬에 바인딩
+        type_index = _TYPE_MAP.get
+        handlers = self._handlers
+        batch_handlers = self._batch_handlers
+        recv = self.websocket.recv
+        loop = asyncio.get_running_loop()
+
         while self.running:
             try:
-                message = await self.websocket.recv()
+                message = await recv()
                 if not message: continue
-                
-                try:
-                    data = json.loads(message)
-                except json.JSONDecodeError: continue
 
-                m_type = data.get("type") or data.get("event_type")
-                if m_type in self.message_handlers:
-                    await self.message_handlers[m_type](data)
-            
+                # 버스트 대응: 큐에 대기 중인 프레임까지 한 번에 회수하여 스케줄링 비용 분할 상환
+                frames = [message]
+                frames.extend(self._drain_pending(_MAX_DRAIN - 1))
+
+                parsed = []
+                for frame in frames:
+                    try:
+                        if len(frame) > _LARGE_FRAME_BYTES:
+                            # 대형 스냅샷은 전용 스레드에서 파싱하여 루프 지연(p99) 방지
+                            parsed.append(
+                                await loop.run_in_executor(_PARSE_EXECUTOR, _loads, frame)
+                            )
+                        else:
+                            # orjson은 bytes/공백 포함 입력을 그대로 처리 (strip/디코드 복사 불필요)
+                            parsed.append(_loads(frame))
+                    except ValueError:
+                        continue
+
+                if len(parsed) <= 1:
+                    # 프레임이 하나면 기존 경로와 동일한 지연으로 즉시 디스패치
+                    for data in parsed:
+                        idx = type_index(data.get("type") or data.get("event_type"))
+                        if idx is not None and idx < len(handlers):
+                            handler = handlers[idx]
+                            if handler is not None:
+                                await handler(data)
+                    continue
+
+                # 타입별로 묶어 핸들러 조회/호출 횟수를 배치 크기만큼 절약
+                grouped: dict[int, list] = {}
+                for data in parsed:
+                    idx = type_index(data.get("type") or data.get("event_type"))
+                    if idx is not None:
+                        grouped.setdefault(idx, []).append(data)
+
+                for idx, batch in grouped.items():
+                    if idx >= len(handlers):
+                        continue
+                    batch_handler = batch_handlers[idx]
+                    if batch_handler is not None:
+                        await batch_handler(batch)
+                        continue
+                    handler = handlers[idx]
+                    if handler is not None:
+                        for data in batch:
+                            await handler(data)
+
+            except (websockets.ConnectionClosed, OSError) as e:
+                if self.running:
+                    await self._backoff_reconnect(e)
+                    # 새 소켓의 recv를 다시 로컬에 바인딩
+                    recv = self.websocket.recv
             except Exception as e:
                 if self.running:
-                    logger.warning("websocket_listen_error_reconnecting", error=str(e))
-                    await asyncio.sleep(2)
-                    try: await self.connect()
-                    except: continue
+                    if self._is_websocket_open():
+                        # 연결은 멀쩡하고 핸들러만 실패 — 해당 프레임만 버리고 즉시 계속
+                        # (게이트를 닫거나 백오프하면 살아있는 스트림 전체가 지연됨)
+                        logger.warning("websocket_handler_error_frame_skipped", error=str(e))
+                    else:
+                        await self._backoff_reconnect(e)
+                        recv = self.websocket.recv
+
+    async def _backoff_reconnect(self, error: Exception):
+        """연결 수준 오류 복구: 게이트를 닫고 지수 백오프 후 재연결."""
+        # 죽은 소켓으로의 전송을 막기 위해 게이트를 먼저 닫음
+        self._ready.clear()
+        # 지수 백오프 + 지터: 첫 재시도 ~100ms, 최대 30초, 동시 재접속 분산
+        # (지수는 클램프 — 장시간 연속 실패 시 2**n의 int→float 변환 OverflowError 방지)
+        delay = min(0.1 * (2 ** min(self._retries, 10)), 30.0)
+        delay *= 0.5 + random.random()
+        self._retries += 1
+        logger.warning("websocket_listen_error_reconnecting",
+                       error=str(error), retry_in=round(delay, 2))
+        await asyncio.sleep(delay)
+        try:
+            # TLS 핸드셰이크가 멈춰도 listen이 영원히 막히지 않도록 상한 설정
+            async with asyncio.timeout(30):
+                await self.connect()
+        except Exception:
+            pass
 
     async def close(self):
         self.running = False
+        self._ready.clear()
         if self.websocket:
             await self.websocket.close()
\ No newline at end of file
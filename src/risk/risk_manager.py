@@ -1,16 +1,72 @@
 from __future__ import annotations
+import logging
 from typing import Any
+import numpy as np
 import structlog
 from src.config import Settings
 from src.inventory.inventory_manager import InventoryManager
 
 logger = structlog.get_logger(__name__)
+# [성능] 핫패스에서 structlog 프로세서 체인을 타기 전에 레벨을 먼저 확인
+_stdlib_logger = logging.getLogger(__name__)
+
+# 호출마다 문자열을 새로 만들지 않도록 이벤트명을 모듈 상수로 고정
+_EVT_RECOVERY_TARGET_SET = "🎯 RECOVERY_TARGET_SET"
+_EVT_MARKET_CRASHED = "🚨 MARKET_PRICE_CRASHED_BELOW_RECOVERY_LIMIT"
+_EVT_SLIPPAGE_TOO_HIGH = "🚨 SLIPPAGE_TOO_HIGH"
+_EVT_RESET_SUCCESS = "🔄 RISK_MANAGER_RESET_SUCCESS"
+
+# [성능] numba가 있으면 순수 수치 커널을 네이티브 코드로 컴파일 (미설치 시 순수 파이썬)
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+
+@njit(cache=True)
+def _slippage_exceeded(side_sign: float, expected: float, actual: float, limit: float) -> bool:
+    return side_sign * (actual - expected) > limit
+
+
+@njit(cache=True)
+def _below_danger_zone(min_recovery: float, best_bid: float, factor: float = 0.85) -> bool:
+    return best_bid < min_recovery * factor
+
+
+def _level_size(item) -> float:
+    """리스트([p, s])와 딕셔너리({'size': s}) 구조 모두 대응"""
+    if isinstance(item, list) and len(item) > 1:
+        return float(item[1])
+    return float(item.get('size', 0))
+
+
+def size_array(levels: list) -> np.ndarray:
+    """호가 리스트를 float64 사이즈 배열(SoA)로 변환 — 북 수신 시 한 번만 호출"""
+    return np.fromiter((_level_size(lv) for lv in levels), dtype=np.float64, count=len(levels))
 
 class RiskManager:
     def __init__(self, settings: Settings, inventory_manager: InventoryManager):
         self.settings = settings
         self.inventory_manager = inventory_manager
         self.is_halted = False
+
+        # [성능] 핫패스가 pydantic Settings 속성 체인을 매번 타지 않도록 생성 시점에 float로 고정
+        # (njit 커널에 바로 넘길 수 있는 순수 float이기도 함)
+        self._max_allowed_slippage = float(settings.max_allowed_slippage)
+        self._emergency_skew_limit = float(settings.emergency_skew_limit)
+
+        # [성능] side 문자열 분기 대신 참조 테이블로 노출 한도 검사 메서드를 선택
+        self._can_quote = {
+            "BUY": inventory_manager.can_quote_yes,
+            "SELL": inventory_manager.can_quote_no,
+        }
+        # (side, 사이즈 버킷) → (inventory version, 결과) — 같은 틱 내 반복 검사 생략
+        self._quote_check_cache: dict[tuple[str, int], tuple[int, bool]] = {}
         
         # [추가] 원금 회수를 위한 마지노선 가격 관리
         self.min_recovery_price = 0.0
@@ -21,29 +77,37 @@ class RiskManager:
         # 원금 1.0 - 판 가격 = 남은 쪽의 최소 판매가
         self.min_recovery_price = max(1.0 - sold_price, 0.01)
         self.is_leg_risk_active = True
-        logger.info("🎯 RECOVERY_TARGET_SET", min_price=self.min_recovery_price)
+        # 체결마다 호출되는 경로 — 레벨이 꺼져 있으면 이벤트 딕셔너리 생성 자체를 생략
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info(_EVT_RECOVERY_TARGET_SET, min_price=self.min_recovery_price)
 
     def validate_obi(self, orderbook: dict) -> tuple[bool, str]:
-        bids = orderbook.get("bids", [])
-        asks = orderbook.get("asks", [])
-        
-        if not bids or not asks: return False, "EMPTY_ORDERBOOK"
-
-        # [수정] 리스트([p, s])와 딕셔너리({'size': s}) 구조 모두 대응
-        def get_size(item):
-            if isinstance(item, list) and len(item) > 1: return float(item[1])
-            return float(item.get('size', 0))
-
-        bid_vol = sum(get_size(b) for b in bids[:3])
-        ask_vol = sum(get_size(a) for a in asks[:3])
-        
-        if (bid_vol + ask_vol) == 0: return False, "NO_LIQUIDITY"
+        # [성능] 북 수신 시 미리 계산된 상위 3호가 물량 합을 우선 사용 — 검증마다 O(1) 읽기
+        bid_vol = orderbook.get("top3_bid_sum")
+        ask_vol = orderbook.get("top3_ask_sum")
+
+        if bid_vol is None or ask_vol is None:
+            # 합계 캐시가 없는 호출자는 사이즈 배열(혹은 원본 리스트)에서 한 번 계산
+            bid_sizes = orderbook.get("bid_sizes")
+            ask_sizes = orderbook.get("ask_sizes")
+            if bid_sizes is None or ask_sizes is None:
+                bid_sizes = size_array(orderbook.get("bids", []))
+                ask_sizes = size_array(orderbook.get("asks", []))
+            bid_vol = float(bid_sizes[:3].sum())
+            ask_vol = float(ask_sizes[:3].sum())
+
+        # 한쪽이라도 상위 호가 물량이 없으면 거부 — 사유 구분은 거부 시에만 조회
+        if bid_vol == 0.0 or ask_vol == 0.0:
+            # 호가 레벨 자체가 없으면 EMPTY, 레벨은 있는데 물량이 0이면 NO_LIQUIDITY
+            if not orderbook.get("bids") or not orderbook.get("asks"):
+                return False, "EMPTY_ORDERBOOK"
+            return False, "NO_LIQUIDITY"
         
         obi = (bid_vol - ask_vol) / (bid_vol + ask_vol)
         if obi > 0.8: return False, "HIGH_BUY_PRESSURE" # 기준 완화(0.7 -> 0.8)
         return True, "OK"
 
-    def validate_order(self, side: str, price: float, orderbook: dict[str, Any]) -> tuple[bool, str]:
+    def validate_order(self, side: str, price: float, orderbook: dict[str, Any], size: float = 0.0) -> tuple[bool, str]:
         """주문 실행 전 최종 승인 로직"""
         # 1. 시스템 중단 확인
         if self.is_halted:
@@ -53,6 +117,21 @@ class RiskManager:
         if side == "BUY":
             return False, "BUY_ORDERS_PROHIBITED_IN_MINT_STRATEGY"
 
+        # 2.5 노출 한도 검사 — side별 메서드를 미리 만든 참조 테이블에서 선택
+        # 인벤토리 version이 그대로면 같은 (side, size) 조합의 결과를 재사용
+        if size > 0:
+            cache_key = (side, round(size * 100))
+            version = self.inventory_manager.version
+            cached = self._quote_check_cache.get(cache_key)
+            if cached is not None and cached[0] == version:
+                allowed = cached[1]
+            else:
+                can_quote = self._can_quote.get(side)
+                allowed = can_quote(size) if can_quote is not None else True
+                self._quote_check_cache[cache_key] = (version, allowed)
+            if not allowed:
+                return False, "MAX_SHARE_EXPOSURE_EXCEEDED"
+
         # 3. 본전 사수 검증 (가장 중요)
         if self.is_leg_risk_active:
             if price < self.min_recovery_price:
@@ -75,17 +154,19 @@ class RiskManager:
             return
 
         # 시장가(Bid)가 내 마지노선보다 15% 이상 낮아지면 비상 상황으로 판단
-        danger_zone = self.min_recovery_price * 0.85
-        if current_best_bid < danger_zone:
+        if _below_danger_zone(self.min_recovery_price, current_best_bid):
             self.is_halted = True
-            logger.error("🚨 MARKET_PRICE_CRASHED_BELOW_RECOVERY_LIMIT", 
-                         market_bid=current_best_bid, 
+            # is_halted를 바꾸는 비상 경로는 한 번만 발화하므로 가드 없이 기록
+            logger.error(_EVT_MARKET_CRASHED,
+                         market_bid=current_best_bid,
                          target=self.min_recovery_price)
 
-    def validate_execution_price(self, expected_price: float, actual_price: float) -> bool:
-        """실제 체결가가 내가 낸 주문가보다 너무 낮으면 멈춥니다 (슬리피지 방어)"""
-        if actual_price < (expected_price - self.settings.max_allowed_slippage):
-            logger.error("🚨 SLIPPAGE_TOO_HIGH", expected=expected_price, actual=actual_price)
+    def validate_execution_price(self, expected_price: float, actual_price: float, side: str = "SELL") -> bool:
+        """실제 체결가가 주문가보다 불리하게 밀리면 멈춥니다 (슬리피지 방어)"""
+        # [성능] side별 분기 대신 부호 곱으로 단일 비교 (BUY: 비싸게, SELL: 싸게 체결되면 불리)
+        sign = 1.0 if side == "BUY" else -1.0
+        if _slippage_exceeded(sign, expected_price, actual_price, self._max_allowed_slippage):
+            logger.error(_EVT_SLIPPAGE_TOO_HIGH, expected=expected_price, actual=actual_price, side=side)
             self.is_halted = True
             return False
         return True
@@ -95,6 +176,4 @@ class RiskManager:
         self.is_halted = False
         self.is_leg_risk_active = False
         self.min_recovery_price = 0.0
-        logger.info("🔄 RISK_MANAGER_RESET_SUCCESS")
-
-
+        logger.info(_EVT_RESET_SUCCESS)
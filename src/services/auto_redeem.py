@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 import httpx
@@ -7,24 +8,43 @@ import structlog
 
 from src.config import Settings
 
+# [성능] 응답 바이트를 orjson으로 직접 파싱 (미설치 시 stdlib 폴백)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
 logger = structlog.get_logger(__name__)
 
 class AutoRedeem:
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # 커넥션 풀 재사용으로 요청마다 TLS 핸드셰이크를 반복하지 않음
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        try:
+            # HTTP/2 멀티플렉싱 (httpx[http2] 필요)
+            self.client = httpx.AsyncClient(http2=True, timeout=30.0, limits=limits)
+        except ImportError:
+            logger.warning("http2_unavailable_falling_back_to_http1")
+            self.client = httpx.AsyncClient(timeout=30.0, limits=limits)
 
     async def check_redeemable_positions(self, address: str) -> list[dict[str, Any]]:
+        """리딤 가능 포지션 중 임계값(redeem_threshold_usd) 이상만 반환합니다."""
         try:
             # [수정] CLOB API 대신 Gamma API 사용
             data_api_url = "https://data-api.polymarket.com/positions" # 도메인을 data-api로 변경
-            
+
             response = await self.client.get(
                 data_api_url,
                 params={"user": address, "redeemable": "true"},
             )
             response.raise_for_status()
-            return response.json()
+            positions = _loads(await response.aread())
+            # 더스트 포지션을 파싱 직후 걸러내어 원본 리스트가 바로 회수되게 함
+            threshold = self.settings.redeem_threshold_usd
+            return [p for p in positions if float(p.get("value", 0)) >= threshold]
         except Exception as e:
             logger.error("redeemable_positions_check_failed", error=str(e))
             return []
@@ -46,18 +66,21 @@ class AutoRedeem:
         if not self.settings.auto_redeem_enabled:
             return 0
         
-        redeemable = await self.check_redeemable_positions(address)
-        redeemed = 0
-        
-        for position in redeemable:
-            # 설정된 최소 금액(USD) 이상일 때만 리딤 실행
-            value_usd = float(position.get("value", 0))
-            if value_usd >= self.settings.redeem_threshold_usd:
-                if await self.redeem_position(position.get("id")):
-                    redeemed += 1
-        
+        # 임계값 필터링은 check_redeemable_positions가 파싱 단계에서 수행
+        eligible = await self.check_redeemable_positions(address)
+        if not eligible:
+            return 0
+
+        # 포지션별 리딤을 동시에 실행 — 전체 지연이 RTT 합이 아닌 최대 RTT에 수렴
+        results = await asyncio.gather(
+            *(self.redeem_position(p.get("id")) for p in eligible),
+            return_exceptions=True,
+        )
+        redeemed = sum(1 for r in results if r is True)
+
+
         if redeemed > 0:
-            logger.info("auto_redeem_summary", redeemed_count=redeemed, total_found=len(redeemable))
+            logger.info("auto_redeem_summary", redeemed_count=redeemed, total_eligible=len(eligible))
         return redeemed
 
     async def close(self):
@@ -24,23 +24,44 @@ halt_status_gauge = Gauge("pm_mm_halt_status", "System halt status (1 if halted)
 
 spread_gauge = Gauge("pm_mm_spread_bps", "Current spread in basis points")
 profit_gauge = Gauge("pm_mm_profit_usd", "Cumulative profit in USD")
+# [수정] 서브-10ms 구간이 전부 첫 버킷에 뭉치지 않도록 로그 스케일 버킷 적용
 quote_latency_histogram = Histogram(
     "pm_mm_quote_latency_ms",
     "Quote generation and placement latency in milliseconds",
-    buckets=[10, 50, 100, 250, 500, 1000],
+    buckets=[0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000],
 )
 
 
+# [성능] 핫패스에서 .labels()의 해시/딕셔너리 조회를 건너뛰기 위해
+# 예상되는 라벨 조합의 child를 임포트 시점에 미리 바인딩
+_SIDES = ("BUY", "SELL")
+_OUTCOMES = ("YES", "NO")
+_PLACED = {
+    (s, o): orders_placed_counter.labels(side=s, outcome=o)
+    for s in _SIDES for o in _OUTCOMES
+}
+_FILLED = {
+    (s, o): orders_filled_counter.labels(side=s, outcome=o)
+    for s in _SIDES for o in _OUTCOMES
+}
+
+
 def start_metrics_server(host: str, port: int) -> None:
     start_http_server(port, addr=host)
 
 
 def record_order_placed(side: str, outcome: str) -> None:
-    orders_placed_counter.labels(side=side, outcome=outcome).inc()
+    counter = _PLACED.get((side, outcome))
+    if counter is None:  # 예상 밖의 라벨 조합은 기존 경로로
+        counter = orders_placed_counter.labels(side=side, outcome=outcome)
+    counter.inc()
 
 
 def record_order_filled(side: str, outcome: str) -> None:
-    orders_filled_counter.labels(side=side, outcome=outcome).inc()
+    counter = _FILLED.get((side, outcome))
+    if counter is None:
+        counter = orders_filled_counter.labels(side=side, outcome=outcome)
+    counter.inc()
 
 
 def record_order_cancelled() -> None: